@@ -2,21 +2,51 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 
 import httpx
+import msgspec
 from tenacity import (
     AsyncRetrying,
     RetryError,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
 from .logger import get_logger
 from .text_rules import contains_cyrillic
 
 DEFAULT_MODEL = "deepseek-chat"
+SYSTEM_PROMPT = (
+    "Ты — аналитик Binance. Переведи или кратко перефразируй текст на русский "
+    "язык, сохранив ключевые факты и числа."
+)
+BATCH_SYSTEM_PROMPT = (
+    f"{SYSTEM_PROMPT} Тексты пронумерованы. Переведи каждый пункт, верни JSON "
+    "массив строк в порядке ввода без нумерации и пояснений."
+)
+# Крупный пакет упирается в лимит ответа модели и обрезается, поэтому тексты
+# отправляются порциями; запасной перевод по одному ограничен по параллельности.
+MAX_BATCH_SIZE = 10
+MAX_CONCURRENT_REQUESTS = 8
+
+
+class _CompletionMessage(msgspec.Struct):
+    content: str
+
+
+class _CompletionChoice(msgspec.Struct):
+    message: _CompletionMessage
+
+
+class _CompletionResponse(msgspec.Struct):
+    choices: list[_CompletionChoice]
+
+
+_RESPONSE_DECODER = msgspec.json.Decoder(_CompletionResponse)
+_BATCH_DECODER = msgspec.json.Decoder(list[str])
 
 
 class DeepSeekClient:
@@ -37,6 +67,29 @@ class DeepSeekClient:
         self.model = model
         self.timeout = httpx.Timeout(10.0, read=request_timeout)
         self.logger = get_logger(__name__)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+        self._system_message = {"role": "system", "content": SYSTEM_PROMPT}
+        self._batch_system_message = {"role": "system", "content": BATCH_SYSTEM_PROMPT}
+        self._inflight = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def __aenter__(self) -> DeepSeekClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закрывает пул HTTP-соединений."""
+
+        await self._client.aclose()
 
     async def ensure_localization(self, *, text: str) -> str:
         """Переводит или перефразирует текст, если отсутствует кириллица."""
@@ -44,25 +97,74 @@ class DeepSeekClient:
         if contains_cyrillic(text):
             return text
 
+        completion = await self._complete(
+            system_message=self._system_message, user_text=text
+        )
+        return completion if completion is not None else text
+
+    async def ensure_localization_batch(self, texts: list[str]) -> list[str]:
+        """Локализует тексты без кириллицы пакетными запросами к DeepSeek.
+
+        Тексты отправляются порциями по ``MAX_BATCH_SIZE``; если ответ на порцию
+        не удаётся разобрать, её тексты переводятся по одному.
+        """
+
+        localized = list(texts)
+        pending = [
+            index for index, text in enumerate(texts) if not contains_cyrillic(text)
+        ]
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start : start + MAX_BATCH_SIZE]
+            translations = await self._localize_chunk([texts[i] for i in chunk])
+            for index, translation in zip(chunk, translations, strict=True):
+                localized[index] = translation.strip()
+        return localized
+
+    async def _localize_chunk(self, texts: list[str]) -> list[str]:
+        if len(texts) < 2:
+            return [await self.ensure_localization(text=text) for text in texts]
+
+        user_text = "\n\n".join(
+            f"{number}. {text}" for number, text in enumerate(texts, start=1)
+        )
+        completion = await self._complete(
+            system_message=self._batch_system_message, user_text=user_text
+        )
+        translations = _parse_batch(completion)
+        if translations is not None and len(translations) == len(texts):
+            return translations
+
+        self.logger.error(
+            "Не удалось разобрать пакетный ответ DeepSeek, перевод по одному",
+            context={"model": self.model, "count": len(texts)},
+        )
+        return await self._localize_each(texts)
+
+    async def _localize_each(self, texts: list[str]) -> list[str]:
+        """Переводит тексты по одному; ошибка любого запроса отменяет остальные."""
+
+        async def localize(text: str) -> str:
+            async with self._inflight:
+                return await self.ensure_localization(text=text)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(localize(text)) for text in texts]
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        return [task.result() for task in tasks]
+
+    async def _complete(
+        self, *, system_message: dict[str, str], user_text: str
+    ) -> str | None:
         request_payload = {
             "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "Ты — аналитик Binance. Переведи или кратко перефразируй текст на русский язык, сохранив ключевые факты и числа.",
-                },
-                {"role": "user", "content": text},
-            ],
-        }
-
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
+            "messages": [system_message, {"role": "user", "content": user_text}],
         }
 
         try:
             async for attempt in AsyncRetrying(
-                wait=wait_exponential(multiplier=1, min=1, max=30),
+                wait=wait_exponential_jitter(initial=1, max=30, jitter=2),
                 stop=stop_after_attempt(4),
                 retry=retry_if_exception_type(
                     (
@@ -74,25 +176,20 @@ class DeepSeekClient:
                 reraise=True,
             ):
                 with attempt:
-                    async with httpx.AsyncClient(
-                        base_url=self.base_url, timeout=self.timeout
-                    ) as client:
-                        response = await client.post(
-                            "/v1/chat/completions",
-                            json=request_payload,
-                            headers=headers,
-                        )
-                        response.raise_for_status()
-                        data = response.json()
-                        completion = data["choices"][0]["message"]["content"].strip()
-                        self.logger.info(
-                            "Получен ответ DeepSeek",
-                            context={
-                                "model": self.model,
-                                "status_code": response.status_code,
-                            },
-                        )
-                        return completion
+                    response = await self._client.post(
+                        "/v1/chat/completions", json=request_payload
+                    )
+                    response.raise_for_status()
+                    data = _RESPONSE_DECODER.decode(response.content)
+                    completion = data.choices[0].message.content.strip()
+                    self.logger.info(
+                        "Получен ответ DeepSeek",
+                        context={
+                            "model": self.model,
+                            "status_code": response.status_code,
+                        },
+                    )
+                    return completion
         except RetryError as exc:
             error = exc.last_attempt.exception()
             self.logger.error(
@@ -101,7 +198,28 @@ class DeepSeekClient:
             )
             raise
 
-        return text
+        return None
+
+
+def _parse_batch(completion: str | None) -> list[str] | None:
+    """Извлекает JSON-массив переводов, допуская обёртку в блок кода.
+
+    Пустой элемент считается ошибкой разбора: иначе вместо сообщения была бы
+    опубликована пустая нитка.
+    """
+
+    if not completion:
+        return None
+    body = completion.strip()
+    if body.startswith("```"):
+        body = body.strip("`").removeprefix("json").strip()
+    try:
+        translations = _BATCH_DECODER.decode(body)
+    except msgspec.DecodeError:
+        return None
+    if not all(translation.strip() for translation in translations):
+        return None
+    return translations
 
 
 def _get_env(name: str) -> str:
@@ -5,17 +5,27 @@ from __future__ import annotations
 import json
 import logging
 import os
-from datetime import UTC, datetime
+import time
+from collections.abc import Callable
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 SENSITIVE_SUBSTRINGS = ("token", "secret", "key", "hash", "session", "password")
 
+# Решение о маскировании по имени ключа: набор ключей контекста невелик и
+# практически не меняется, поэтому проверка подстрок выполняется один раз.
+_SENSITIVE_DECISION: dict[str, bool] = {}
+
 
 class JsonFormatter(logging.Formatter):
     """Форматтер для вывода логов в JSON с маскированием секретов."""
 
     def format(self, record: logging.LogRecord) -> str:
-        ts = datetime.now(tz=UTC).isoformat().replace("+00:00", "Z")
+        ts = _format_timestamp(record.created)
         context = getattr(record, "_context", {})
         payload: dict[str, Any] = {
             "ts": ts,
@@ -23,19 +33,38 @@ class JsonFormatter(logging.Formatter):
             "msg": record.getMessage(),
             "context": sanitize_context(context),
         }
+        return _dumps(payload)
+
+
+def _dumps(payload: dict[str, Any]) -> str:
+    """Сериализует запись лога в компактный JSON без экранирования кириллицы."""
+
+    if orjson is None:  # pragma: no cover
         return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return orjson.dumps(payload).decode("utf-8")
+
+
+def _format_timestamp(created: float) -> str:
+    """Форматирует время записи в ISO 8601 (UTC) без создания datetime."""
+
+    seconds = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(created))
+    return f"{seconds}.{int(created % 1 * 1_000_000):06d}Z"
 
 
 def sanitize_context(context: dict[str, Any]) -> dict[str, Any]:
     """Маскирует секретные значения в контексте."""
 
+    decisions = _SENSITIVE_DECISION
     safe_context: dict[str, Any] = {}
     for key, value in context.items():
-        lowered_key = key.lower()
-        if any(fragment in lowered_key for fragment in SENSITIVE_SUBSTRINGS):
-            safe_context[key] = "***"
-        else:
-            safe_context[key] = value
+        sensitive = decisions.get(key)
+        if sensitive is None:
+            lowered_key = key.lower()
+            sensitive = any(
+                fragment in lowered_key for fragment in SENSITIVE_SUBSTRINGS
+            )
+            decisions[key] = sensitive
+        safe_context[key] = "***" if sensitive else value
     return safe_context
 
 
@@ -48,6 +77,14 @@ class ContextLogger(logging.LoggerAdapter):
         kwargs["extra"]["_context"] = context
         return msg, kwargs
 
+    def log_if(
+        self, level: int, msg: str, build_context: Callable[[], dict[str, Any]]
+    ) -> None:
+        """Логирует сообщение, вычисляя контекст только для включённого уровня."""
+
+        if self.isEnabledFor(level):
+            self.log(level, msg, context=build_context())
+
 
 def configure_logging() -> None:
     """Инициализирует корневой логгер при первом вызове."""
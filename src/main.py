@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import logging
 import os
 from pathlib import Path
 
 from .deepseek_client import DeepSeekClient
 from .logger import get_logger
 from .state_store import StateStore
-from .telegram_source import TelegramSource
+from .telegram_source import TelegramMessage, TelegramSource
 from .text_rules import build_thread, generate_hashtags
 from .twitter_client import TwitterClient
 
@@ -23,28 +24,71 @@ async def run(*, dry_run: bool) -> None:
     state_store = StateStore(Path("state.json"))
     state = state_store.read()
     telegram_source = TelegramSource()
-    deepseek_client = DeepSeekClient()
-    twitter_client = TwitterClient(dry_run=dry_run)
-
-    messages = await telegram_source.fetch_new_messages(last_seen_id=state.last_seen_id)
-    if not messages:
-        logger.info("Новых сообщений нет", context={"last_seen_id": state.last_seen_id})
-        return
-
-    for message in messages:
-        localized_text = await deepseek_client.ensure_localization(text=message.text)
-        hashtags = generate_hashtags(localized_text)
-        thread = build_thread(
-            message_id=message.message_id, text=localized_text, hashtags=hashtags
-        )
-        tweet_ids = await twitter_client.post_thread(thread)
-        if tweet_ids:
-            state_store.update_last_seen(message_id=message.message_id, dry_run=dry_run)
+
+    async with TwitterClient(dry_run=dry_run) as twitter_client:
+        try:
+            messages = await telegram_source.fetch_new_messages(
+                last_seen_id=state.last_seen_id
+            )
+        finally:
+            await telegram_source.aclose()
+        if not messages:
             logger.info(
-                "Сообщение опубликовано",
-                context={"message_id": message.message_id, "tweets": tweet_ids},
+                "Новых сообщений нет", context={"last_seen_id": state.last_seen_id}
+            )
+            return
+
+        async with DeepSeekClient() as deepseek_client:
+            localized_texts = await deepseek_client.ensure_localization_batch(
+                [message.text for message in messages]
             )
 
+        # Нитки публикуются строго по порядку: при сбое оставшиеся сообщения
+        # не отправляются, а состояние фиксируется на последнем успешном,
+        # поэтому следующий запуск продолжит без дублей и без пропусков.
+        try:
+            for message, localized_text in zip(messages, localized_texts, strict=True):
+                await _publish(twitter_client, message, localized_text)
+                state_store.update_last_seen(
+                    message_id=message.message_id, dry_run=dry_run
+                )
+        except Exception as error:
+            logger.error(
+                "Ошибка обработки сообщения",
+                context={"message_id": message.message_id, "error": str(error)},
+            )
+            raise
+        finally:
+            state_store.flush()
+
+
+async def _publish(
+    twitter_client: TwitterClient,
+    message: TelegramMessage,
+    localized_text: str,
+) -> list[str]:
+    """Публикует нитку для одного сообщения.
+
+    Ответ без идентификаторов твитов считается ошибкой: иначе сообщение
+    осталось бы неопубликованным, а состояние сдвинулось бы дальше него.
+    """
+
+    hashtags = generate_hashtags(localized_text)
+    thread = build_thread(
+        message_id=message.message_id,
+        text=localized_text,
+        hashtags=hashtags,
+    )
+    tweet_ids = await twitter_client.post_thread(thread)
+    if not tweet_ids:
+        raise RuntimeError("Twitter не вернул идентификаторы опубликованной нитки")
+    logger.log_if(
+        logging.INFO,
+        "Сообщение опубликовано",
+        lambda: {"message_id": message.message_id, "tweets": tweet_ids},
+    )
+    return tweet_ids
+
 
 def _env_dry_run_default() -> bool:
     """Возвращает значение режима dry-run из переменной окружения."""
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
+import msgspec
+
 from .logger import get_logger
 
-try:
-    import orjson as json_lib
-except ImportError:  # pragma: no cover
-    import json as json_lib
+DEFAULT_STATE = {"last_seen_id": 0}
 
 
-DEFAULT_STATE = {"last_seen_id": 0}
+class _StateRecord(msgspec.Struct):
+    last_seen_id: int = 0
+
+
+_STATE_DECODER = msgspec.json.Decoder(_StateRecord, strict=False)
+_STATE_ENCODER = msgspec.json.Encoder()
+
+
+def _decode_last_seen(raw: bytes) -> int:
+    return _STATE_DECODER.decode(raw).last_seen_id
+
+
+def _encode_state(data: dict) -> bytes:
+    return _STATE_ENCODER.encode(_StateRecord(last_seen_id=data["last_seen_id"]))
 
 
 @dataclass(slots=True)
@@ -29,10 +42,17 @@ class StateStore:
     def __init__(self, path: Path) -> None:
         self.path = path
         self.logger = get_logger(__name__)
+        self._cached: ProcessingState | None = None
+        self._dirty = False
 
     def read(self) -> ProcessingState:
-        """Читает состояние из файла."""
+        """Возвращает состояние, читая файл только при первом обращении."""
 
+        if self._cached is None:
+            self._cached = self._load()
+        return self._cached
+
+    def _load(self) -> ProcessingState:
         if not self.path.exists():
             self.logger.info(
                 "Создание нового файла состояния",
@@ -43,8 +63,8 @@ class StateStore:
 
         raw = self.path.read_bytes()
         try:
-            data = json_lib.loads(raw)
-        except (ValueError, TypeError) as error:
+            last_seen = _decode_last_seen(raw)
+        except msgspec.DecodeError as error:
             self.logger.error(
                 "Файл состояния повреждён, восстановление по умолчанию",
                 context={"path": str(self.path), "error": str(error)},
@@ -52,22 +72,17 @@ class StateStore:
             self._write(DEFAULT_STATE)
             return ProcessingState()
 
-        try:
-            last_seen = int(data.get("last_seen_id", 0))
-        except (TypeError, ValueError) as error:
-            self.logger.error(
-                "Некорректное значение last_seen_id в состоянии",
-                context={"path": str(self.path), "error": str(error)},
-            )
-            self._write(DEFAULT_STATE)
-            return ProcessingState()
-
         return ProcessingState(last_seen_id=last_seen)
 
     def update_last_seen(self, *, message_id: int, dry_run: bool) -> ProcessingState:
-        """Обновляет идентификатор последнего обработанного сообщения."""
+        """Обновляет идентификатор последнего обработанного сообщения в памяти.
+
+        Изменения записываются на диск вызовом :meth:`flush`.
+        """
 
-        state = self.read()
+        state = self._cached
+        if state is None:
+            state = self.read()
         if message_id <= state.last_seen_id:
             return state
 
@@ -78,16 +93,37 @@ class StateStore:
             )
             return ProcessingState(last_seen_id=message_id)
 
-        self._write({"last_seen_id": message_id})
+        self._cached = ProcessingState(last_seen_id=message_id)
+        self._dirty = True
+        return self._cached
+
+    def flush(self) -> None:
+        """Атомарно сохраняет состояние, если оно изменилось."""
+
+        if not self._dirty or self._cached is None:
+            return
+
+        self._write({"last_seen_id": self._cached.last_seen_id})
+        self._dirty = False
         self.logger.info(
             "Состояние обновлено",
-            context={"last_seen_id": message_id},
+            context={"last_seen_id": self._cached.last_seen_id},
         )
-        return ProcessingState(last_seen_id=message_id)
 
     def _write(self, data: dict) -> None:
-        serialized = json_lib.dumps(data)
-        if isinstance(serialized, bytes):
-            self.path.write_bytes(serialized)
-        else:  # pragma: no cover
-            self.path.write_text(serialized, encoding="utf-8")
+        write_atomic(self.path, _encode_state(data))
+
+
+def write_atomic(path: Path, data: bytes, *, mode: int = 0o666) -> None:
+    """Записывает файл через временный файл и атомарную замену.
+
+    Права задаются при создании временного файла, поэтому содержимое
+    ни в какой момент не доступно шире, чем ``mode``.
+    """
+
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
@@ -14,7 +14,7 @@ from tenacity import (
     RetryError,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
 from .logger import get_logger
@@ -40,6 +40,14 @@ class TelegramSource:
         self.timeout = timeout
         self.fetch_limit = fetch_limit
         self.logger = get_logger(__name__)
+        self._client: TelegramClient | None = None
+
+    async def aclose(self) -> None:
+        """Отключается от Telegram, если соединение было открыто."""
+
+        if self._client is not None:
+            await self._client.disconnect()
+            self._client = None
 
     async def fetch_new_messages(
         self, *, last_seen_id: int | None
@@ -49,7 +57,7 @@ class TelegramSource:
         messages: list[TelegramMessage] = []
         try:
             async for attempt in AsyncRetrying(
-                wait=wait_exponential(multiplier=1, min=1, max=60),
+                wait=wait_exponential_jitter(initial=1, max=60, jitter=2),
                 stop=stop_after_attempt(5),
                 retry=retry_if_exception_type(
                     (FloodWaitError, RPCError, asyncio.TimeoutError)
@@ -74,41 +82,46 @@ class TelegramSource:
             )
             raise
 
-        return sorted(messages, key=lambda msg: msg.message_id)
+        # iter_messages отдаёт сообщения от новых к старым, поэтому для
+        # хронологического порядка достаточно развернуть список.
+        messages.reverse()
+        return messages
+
+    async def _ensure_client(self) -> TelegramClient:
+        if self._client is None:
+            self._client = TelegramClient(
+                StringSession(self.string_session),
+                self.api_id,
+                self.api_hash,
+                connection_retries=3,
+                retry_delay=2,
+                timeout=self.timeout,
+            )
+        if not self._client.is_connected():
+            await self._client.connect()
+        return self._client
 
     async def _fetch_once(self, *, last_seen_id: int | None) -> list[TelegramMessage]:
-        client = TelegramClient(
-            StringSession(self.string_session),
-            self.api_id,
-            self.api_hash,
-            connection_retries=3,
-            retry_delay=2,
-            timeout=self.timeout,
-        )
-
-        await client.connect()
-        try:
-            entity = await client.get_entity(self.channel)
-            collected: list[TelegramMessage] = []
-            async for message in client.iter_messages(entity, limit=self.fetch_limit):
-                if message.message is None:
-                    continue
-                if last_seen_id and message.id <= last_seen_id:
-                    break
-                collected.append(
-                    TelegramMessage(
-                        message_id=message.id,
-                        text=message.message,
-                        date=message.date.isoformat() if message.date else "",
-                    )
+        client = await self._ensure_client()
+        entity = await client.get_entity(self.channel)
+        collected: list[TelegramMessage] = []
+        async for message in client.iter_messages(entity, limit=self.fetch_limit):
+            if message.message is None:
+                continue
+            if last_seen_id and message.id <= last_seen_id:
+                break
+            collected.append(
+                TelegramMessage(
+                    message_id=message.id,
+                    text=message.message,
+                    date=message.date.isoformat() if message.date else "",
                 )
-            self.logger.info(
-                "Получено сообщений",
-                context={"count": len(collected), "channel": self.channel},
             )
-            return collected
-        finally:
-            await client.disconnect()
+        self.logger.info(
+            "Получено сообщений",
+            context={"count": len(collected), "channel": self.channel},
+        )
+        return collected
 
 
 def _get_env(name: str, *, aliases: tuple[str, ...] = ()) -> str:
@@ -29,10 +29,18 @@ EMOJI_KEYWORDS = {
 CYRILLIC_PATTERN = re.compile("[А-Яа-яЁё]")
 HASHTAG_WORD_PATTERN = re.compile(r"[A-Za-z0-9]{3,}")
 
+_WRAPPER = textwrap.TextWrapper(
+    width=MAX_TWEET_LENGTH,
+    break_long_words=False,
+    break_on_hyphens=False,
+)
+
 
 def contains_cyrillic(text: str) -> bool:
     """Проверяет наличие кириллических символов."""
 
+    if text.isascii():
+        return False
     return bool(CYRILLIC_PATTERN.search(text))
 
 
@@ -53,20 +61,20 @@ def insert_emojis(text: str) -> str:
 def generate_hashtags(text: str, *, limit: int = 2) -> list[str]:
     """Генерирует до двух хэштегов на основе текста."""
 
-    candidates = []
+    unique: list[str] = []
+    seen: set[str] = set()
     for match in HASHTAG_WORD_PATTERN.finditer(text):
+        if len(unique) >= limit:
+            break
         word = match.group(0)
         if word.isdigit():
             continue
-        candidates.append(word.lower())
-    unique: list[str] = []
-    for candidate in candidates:
-        if candidate not in unique:
-            unique.append(candidate)
-    hashtags = [
-        candidate.replace("/", "").replace("-", "") for candidate in unique[:limit]
-    ]
-    return [f"#{tag}" for tag in hashtags]
+        candidate = word.lower()
+        if candidate in seen:
+            continue
+        seen.add(candidate)
+        unique.append(candidate)
+    return [f"#{candidate.replace('/', '').replace('-', '')}" for candidate in unique]
 
 
 def build_thread(*, message_id: int, text: str, hashtags: Iterable[str]) -> list[str]:
@@ -80,18 +88,16 @@ def build_thread(*, message_id: int, text: str, hashtags: Iterable[str]) -> list
     if not tweets and main_body:
         tweets = [main_body]
 
+    max_length = MAX_TWEET_LENGTH
     safe_hashtags = _fit_hashtags(hashtags)
     hashtags_line = " ".join(safe_hashtags).strip()
     if hashtags_line and tweets:
-        if len(tweets[-1]) + 2 + len(hashtags_line) <= MAX_TWEET_LENGTH:
+        if len(tweets[-1]) + 2 + len(hashtags_line) <= max_length:
             tweets[-1] = f"{tweets[-1]}\n\n{hashtags_line}"
         else:
-            tweets.extend(
-                _chunk_text(hashtags_line) or [hashtags_line[:MAX_TWEET_LENGTH]]
-            )
+            tweets.extend(_chunk_text(hashtags_line) or [hashtags_line[:max_length]])
 
-    for tail in _chunk_text(BINANCE_LINKS_BLOCK):
-        tweets.append(tail)
+    tweets.extend(_BINANCE_LINKS_CHUNKS)
 
     return tweets
 
@@ -103,15 +109,14 @@ def _chunk_text(text: str) -> list[str]:
     if not normalized:
         return []
 
+    max_length = MAX_TWEET_LENGTH
     chunks: list[str] = []
     paragraphs = normalized.split("\n\n")
     for paragraph in paragraphs:
-        lines = textwrap.wrap(
-            paragraph,
-            width=MAX_TWEET_LENGTH,
-            break_long_words=False,
-            break_on_hyphens=False,
-        )
+        if _fits_without_wrapping(paragraph):
+            lines = [paragraph]
+        else:
+            lines = _WRAPPER.wrap(paragraph)
         if not lines:
             continue
         for line in lines:
@@ -119,17 +124,32 @@ def _chunk_text(text: str) -> list[str]:
                 if not chunks:
                     chunks.append(piece)
                     continue
-                candidate = f"{chunks[-1]}\n\n{piece}"
-                if len(candidate) <= MAX_TWEET_LENGTH:
-                    chunks[-1] = candidate
+                # Длину склейки считаем арифметически, чтобы не собирать строку,
+                # которая будет отброшена.
+                if len(chunks[-1]) + 2 + len(piece) <= max_length:
+                    chunks[-1] = f"{chunks[-1]}\n\n{piece}"
                 else:
                     chunks.append(piece)
-    return [chunk[:MAX_TWEET_LENGTH] for chunk in chunks]
+    return [chunk[:max_length] for chunk in chunks]
+
+
+def _fits_without_wrapping(paragraph: str) -> bool:
+    """Проверяет, что TextWrapper вернул бы абзац без изменений."""
+
+    # isprintable() исключает переводы строк, табуляции и прочие пробельные
+    # символы, которые TextWrapper заменил бы на пробелы.
+    return (
+        0 < len(paragraph) <= MAX_TWEET_LENGTH
+        and paragraph.isprintable()
+        and paragraph[0] != " "
+        and paragraph[-1] != " "
+    )
 
 
 def _fit_hashtags(hashtags: Iterable[str]) -> list[str]:
     """Ограничивает список хэштегов так, чтобы они помещались в твит."""
 
+    max_length = MAX_TWEET_LENGTH
     result: list[str] = []
     current_length = 0
     for tag in hashtags:
@@ -137,10 +157,10 @@ def _fit_hashtags(hashtags: Iterable[str]) -> list[str]:
         if not tag:
             continue
         proposed_length = len(tag) if not result else current_length + 1 + len(tag)
-        if proposed_length > MAX_TWEET_LENGTH:
+        if proposed_length > max_length:
             break
         result.append(tag)
-        current_length = len(" ".join(result))
+        current_length = proposed_length
     return result
 
 
@@ -157,3 +177,6 @@ def _split_overflow(line: str) -> list[str]:
         pieces.append(line[start:end])
         start = end
     return pieces
+
+
+_BINANCE_LINKS_CHUNKS: tuple[str, ...] = tuple(_chunk_text(BINANCE_LINKS_BLOCK))
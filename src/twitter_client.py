@@ -2,29 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import logging
 import os
 import time
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from urllib.parse import quote_plus, urlencode
 
 import httpx
+import msgspec
 from tenacity import (
     AsyncRetrying,
-    RetryError,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
 
 from .logger import get_logger
+from .state_store import write_atomic
+
+logger = get_logger(__name__)
 
 TOKEN_URL = "https://api.twitter.com/2/oauth2/token"
 TWEET_URL = "https://api.twitter.com/2/tweets"
+WARMUP_URL = "https://api.twitter.com/2/openapi.json"
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+_TOKEN_URL = httpx.URL(TOKEN_URL)
+_TWEET_URL = httpx.URL(TWEET_URL)
+DEFAULT_TOKEN_CACHE = "~/.cache/twitter_token.json"
+DEFAULT_MAX_CONCURRENT_POSTS = 5
+
+
+class _TokenCache(msgspec.Struct):
+    access_token: str
+    expires_at: float
+    refresh_token: str | None = None
+    # Учётные данные, из которых получен кэш: при их смене кэш не используется.
+    client_id: str | None = None
+    source_token_hash: str | None = None
+
+
+class _TweetData(msgspec.Struct):
+    id: str | None = None
+
+
+class _TweetResponse(msgspec.Struct):
+    data: _TweetData | None = None
+
+
+class _TokenResponse(msgspec.Struct):
+    access_token: str | None = None
+    expires_in: int = 3600
+    refresh_token: str | None = None
+
+
+_TOKEN_CACHE_DECODER = msgspec.json.Decoder(_TokenCache)
+_JSON_ENCODER = msgspec.json.Encoder()
+_TWEET_RESPONSE_DECODER = msgspec.json.Decoder(_TweetResponse)
+_TOKEN_RESPONSE_DECODER = msgspec.json.Decoder(_TokenResponse, strict=False)
 
 
 class TwitterClient:
     """Публикует твиты и управляет OAuth2-токенами."""
 
-    def __init__(self, *, dry_run: bool = False, timeout: float = 10.0) -> None:
+    def __init__(
+        self,
+        *,
+        dry_run: bool = False,
+        timeout: float = 10.0,
+        max_concurrent_posts: int | None = None,
+    ) -> None:
         self.dry_run = dry_run
         if self.dry_run:
             self.client_id = _get_optional_env(
@@ -42,14 +93,98 @@ class TwitterClient:
                 "TWITTER_REFRESH_TOKEN",
                 aliases=("TWITTER_ACCESS_TOKEN", "CLIENT_SECRET"),
             )
+        self._source_token_hash = _hash_token(self.refresh_token)
         self.redirect_uri = os.getenv("TWITTER_REDIRECT_URI", "https://localhost")
+        # Неизменная часть тела запроса обновления токена; refresh_token
+        # ротируется Twitter и подставляется при каждом обращении.
+        self._token_body_prefix = (
+            urlencode(
+                {
+                    "grant_type": "refresh_token",
+                    "client_id": self.client_id or "",
+                    "redirect_uri": self.redirect_uri,
+                }
+            )
+            + "&refresh_token="
+        )
         self.timeout = httpx.Timeout(10.0, read=timeout)
-        self.logger = get_logger(__name__)
+        self.max_concurrent_posts = max_concurrent_posts or int(
+            os.getenv("TWITTER_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENT_POSTS))
+        )
+        self._inflight = asyncio.Semaphore(self.max_concurrent_posts)
         self._access_token: str | None = None
+        # Срок действия токена по монотонным часам для решений внутри процесса
+        # и по настенным — для кэша на диске, переживающего перезапуск.
         self._expires_at: float = 0.0
+        self._wall_expires_at: float = 0.0
+        self._auth_headers: dict[str, str] = {}
+        self._warmup_task: asyncio.Task[httpx.Response] | None = None
+        self._token_lock = asyncio.Lock()
+        # Стратегии ретраев собираются один раз; copy() даёт каждому вызову
+        # собственное состояние попыток, что важно при параллельной публикации.
+        self._post_retrying = AsyncRetrying(
+            wait=wait_exponential_jitter(initial=1, max=30, jitter=2),
+            stop=stop_after_attempt(5),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        )
+        self._token_retrying = AsyncRetrying(
+            wait=wait_exponential_jitter(initial=1, max=60, jitter=2),
+            stop=stop_after_attempt(5),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        )
+        self._token_cache_path = Path(
+            os.getenv("TWITTER_TOKEN_CACHE", DEFAULT_TOKEN_CACHE)
+        ).expanduser()
+        if not self.dry_run:
+            self._load_token_cache()
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        )
+
+    async def __aenter__(self) -> TwitterClient:
+        if not self.dry_run:
+            # Устанавливаем TLS-соединение заранее, пока вызывающий код готовит
+            # твиты, чтобы первая публикация не ждала рукопожатия.
+            self._warmup_task = asyncio.create_task(self._client.head(WARMUP_URL))
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закрывает пул HTTP-соединений."""
 
-    async def post_thread(self, tweets: Iterable[str]) -> list[str]:
-        """Публикует последовательность твитов с учетом ответов."""
+        if self._warmup_task is not None:
+            self._warmup_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, httpx.HTTPError):
+                await self._warmup_task
+            self._warmup_task = None
+        await self._client.aclose()
+
+    async def post_thread(
+        self, tweets: Iterable[str], *, parallel: bool = False
+    ) -> list[str]:
+        """Публикует последовательность твитов с учетом ответов.
+
+        При ``parallel=True`` все твиты после первого публикуются одновременно
+        как ответы на первый, а не цепочкой друг за другом.
+        """
+
+        if self.dry_run:
+            texts = list(tweets)
+            logger.log_if(
+                logging.INFO,
+                "DRY_RUN: нитка не отправлена",
+                lambda: {"tweets": len(texts), "text": texts[0][:50] if texts else ""},
+            )
+            return ["dry-run"] * len(texts)
+
+        if parallel:
+            return await self._post_thread_parallel(list(tweets))
 
         tweet_ids: list[str] = []
         previous_id: str | None = None
@@ -63,49 +198,70 @@ class TwitterClient:
                 tweet_ids.append(tweet_id)
         return tweet_ids
 
+    async def _post_thread_parallel(self, tweets: list[str]) -> list[str]:
+        """Публикует ответы на первый твит одновременно.
+
+        Ошибка любого ответа отменяет остальные и пробрасывается как есть;
+        при успехе идентификаторы возвращаются в порядке текстов.
+        """
+
+        if not tweets:
+            return []
+
+        root_id = await self._create_tweet(payload={"text": tweets[0]})
+        if not root_id:
+            return []
+
+        reply = {"in_reply_to_tweet_id": root_id}
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(
+                        self._create_tweet(payload={"text": text, "reply": reply})
+                    )
+                    for text in tweets[1:]
+                ]
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+
+        reply_ids = [task.result() for task in tasks]
+        if not all(reply_ids):
+            raise RuntimeError("Twitter не вернул идентификатор ответа в нитке")
+        return [root_id, *reply_ids]
+
     async def _create_tweet(self, *, payload: dict) -> str | None:
-        if self.dry_run:
-            self.logger.info(
-                "DRY_RUN: твит не отправлен",
-                context={"text": payload.get("text", "")[:50]},
+        if _TWEET_BREAKER.is_open():
+            logger.error(
+                "Публикация приостановлена после серии ошибок Twitter",
+                context={"failures": _TWEET_BREAKER.failures},
             )
-            return "dry-run"
+            raise RuntimeError("Публикация в Twitter временно приостановлена")
 
-        access_token = await self._get_access_token()
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        await self._get_access_token()
+        body = _JSON_ENCODER.encode(payload)
 
         try:
-            async for attempt in AsyncRetrying(
-                wait=wait_exponential(multiplier=1, min=1, max=30),
-                stop=stop_after_attempt(5),
-                retry=retry_if_exception_type(
-                    (
-                        httpx.TransportError,
-                        httpx.HTTPStatusError,
-                        httpx.TimeoutException,
-                    )
-                ),
-                reraise=True,
-            ):
+            async for attempt in self._post_retrying.copy():
                 with attempt:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.post(
-                            TWEET_URL, json=payload, headers=headers
-                        )
-                        response.raise_for_status()
-                        data = response.json()
-                        tweet_id = data.get("data", {}).get("id")
-                        self.logger.info(
-                            "Твит опубликован",
-                            context={"tweet_id": tweet_id},
+                    async with self._inflight:
+                        response = await self._client.post(
+                            _TWEET_URL,
+                            content=body,
+                            headers=self._auth_headers,
                         )
-                        return tweet_id
-        except RetryError as exc:
-            error = exc.last_attempt.exception()
-            self.logger.error(
+                    response.raise_for_status()
+                    data = _TWEET_RESPONSE_DECODER.decode(response.content).data
+                    tweet_id = data.id if data is not None else None
+                    _TWEET_BREAKER.record_success()
+                    logger.info(
+                        "Твит опубликован",
+                        context={"tweet_id": tweet_id},
+                    )
+                    return tweet_id
+        except httpx.HTTPError as error:
+            if _is_retryable(error):
+                _TWEET_BREAKER.record_failure()
+            logger.error(
                 "Ошибка отправки твита",
                 context={"error": str(error)},
             )
@@ -113,63 +269,162 @@ class TwitterClient:
         return None
 
     async def _get_access_token(self) -> str:
-        if not self._access_token or time.time() >= self._expires_at - 60:
-            await self._refresh_access_token()
-        assert self._access_token is not None
-        return self._access_token
-
-    async def _refresh_access_token(self) -> None:
-        data = {
-            "grant_type": "refresh_token",
-            "refresh_token": self.refresh_token,
-            "client_id": self.client_id,
-            "redirect_uri": self.redirect_uri,
-        }
+        access_token = self._access_token
+        if not access_token or time.monotonic() >= self._expires_at - 60:
+            async with self._token_lock:
+                access_token = self._access_token
+                if not access_token or time.monotonic() >= self._expires_at - 60:
+                    access_token = await self._refresh_access_token()
+        return access_token
+
+    async def _refresh_access_token(self) -> str:
+        body = (self._token_body_prefix + quote_plus(self.refresh_token or "")).encode()
 
         try:
-            async for attempt in AsyncRetrying(
-                wait=wait_exponential(multiplier=1, min=1, max=60),
-                stop=stop_after_attempt(5),
-                retry=retry_if_exception_type(
-                    (
-                        httpx.TransportError,
-                        httpx.HTTPStatusError,
-                        httpx.TimeoutException,
-                    )
-                ),
-                reraise=True,
-            ):
+            async for attempt in self._token_retrying.copy():
                 with attempt:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.post(TOKEN_URL, data=data)
-                        response.raise_for_status()
-                        payload = response.json()
-                        self._access_token = payload.get("access_token")
-                        expires_in = int(payload.get("expires_in", 3600))
-                        self._expires_at = time.time() + expires_in
-                        if "refresh_token" in payload:
-                            self.refresh_token = payload["refresh_token"]
-                        self.logger.info(
-                            "Токен обновлён",
-                            context={"expires_in": expires_in},
-                        )
-                        return
-        except RetryError as exc:
-            error = exc.last_attempt.exception()
-            self.logger.error(
+                    response = await self._client.post(
+                        _TOKEN_URL, content=body, headers=_FORM_HEADERS
+                    )
+                    response.raise_for_status()
+                    token = _TOKEN_RESPONSE_DECODER.decode(response.content)
+                    if not token.access_token:
+                        raise RuntimeError("Twitter не вернул access_token")
+                    expires_in = token.expires_in
+                    self._set_access_token(token.access_token, expires_in)
+                    if token.refresh_token is not None:
+                        self.refresh_token = token.refresh_token
+                    logger.info(
+                        "Токен обновлён",
+                        context={"expires_in": expires_in},
+                    )
+                    self._save_token_cache()
+                    return token.access_token
+        except httpx.HTTPError as error:
+            logger.error(
                 "Не удалось обновить токен",
                 context={"error": str(error)},
             )
             raise
+        raise RuntimeError("Не удалось обновить токен Twitter")
+
+    def _set_access_token(self, access_token: str, expires_in: float) -> None:
+        self._access_token = access_token
+        self._expires_at = time.monotonic() + expires_in
+        self._wall_expires_at = time.time() + expires_in
+        self._auth_headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        }
+
+    def _load_token_cache(self) -> None:
+        """Подхватывает сохранённый токен, если он ещё действителен."""
+
+        if not self._token_cache_path.exists():
+            return
+        try:
+            cache = _TOKEN_CACHE_DECODER.decode(self._token_cache_path.read_bytes())
+        except (OSError, msgspec.DecodeError) as error:
+            logger.error(
+                "Кэш токена Twitter повреждён, будет выполнено обновление",
+                context={"path": str(self._token_cache_path), "error": str(error)},
+            )
+            return
+
+        if (
+            cache.client_id != self.client_id
+            or cache.source_token_hash != self._source_token_hash
+        ):
+            logger.info(
+                "Кэш токена Twitter получен для других учётных данных, игнорируется",
+                context={"path": str(self._token_cache_path)},
+            )
+            return
+        if cache.refresh_token:
+            self.refresh_token = cache.refresh_token
+        expires_in = cache.expires_at - time.time()
+        if expires_in > 60:
+            self._set_access_token(cache.access_token, expires_in)
+
+    def _save_token_cache(self) -> None:
+        if self._access_token is None:
+            return
+        cache = _TokenCache(
+            access_token=self._access_token,
+            expires_at=self._wall_expires_at,
+            refresh_token=self.refresh_token,
+            client_id=self.client_id,
+            source_token_hash=self._source_token_hash,
+        )
+        try:
+            self._token_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(
+                self._token_cache_path, _JSON_ENCODER.encode(cache), mode=0o600
+            )
+        except OSError as error:
+            logger.error(
+                "Не удалось сохранить кэш токена Twitter",
+                context={"path": str(self._token_cache_path), "error": str(error)},
+            )
+
+
+class _CircuitBreaker:
+    """Общий для всех клиентов предохранитель от повторов во время сбоев API."""
+
+    def __init__(self, *, threshold: int = 3, max_cooldown: float = 60.0) -> None:
+        self.threshold = threshold
+        self.max_cooldown = max_cooldown
+        self.failures = 0
+        self.open_until = 0.0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            cooldown = min(self.max_cooldown, 2.0**self.failures)
+            self.open_until = time.monotonic() + cooldown
+
+
+_TWEET_BREAKER = _CircuitBreaker()
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Повторяет сетевые сбои, 408, 429 и 5xx; остальные 4xx — ошибки запроса."""
+
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code in (408, 429) or status_code >= 500
+    return isinstance(error, (httpx.TransportError, httpx.TimeoutException))
+
+
+@functools.cache
+def _env_getter(name: str, aliases: tuple[str, ...]) -> Callable[[], str | None]:
+    """Возвращает функцию чтения переменной с заранее собранным списком имён."""
+
+    candidates = (name, *aliases)
+
+    def getter() -> str | None:
+        for candidate in candidates:
+            value = os.getenv(candidate)
+            if value:
+                return value
+        return None
+
+    return getter
 
 
 def _get_env(name: str, *, aliases: tuple[str, ...] = ()) -> str:
     """Возвращает значение переменной окружения с поддержкой синонимов."""
 
-    for candidate in (name, *aliases):
-        value = os.getenv(candidate)
-        if value:
-            return value
+    value = _env_getter(name, aliases)()
+    if value:
+        return value
 
     names = " | ".join((name, *aliases))
     raise RuntimeError(f"Не задана переменная окружения из списка: {names}")
@@ -178,8 +433,12 @@ def _get_env(name: str, *, aliases: tuple[str, ...] = ()) -> str:
 def _get_optional_env(name: str, *, aliases: tuple[str, ...] = ()) -> str | None:
     """Возвращает необязательную переменную окружения, если она задана."""
 
-    for candidate in (name, *aliases):
-        value = os.getenv(candidate)
-        if value:
-            return value
-    return None
+    return _env_getter(name, aliases)()
+
+
+def _hash_token(token: str | None) -> str | None:
+    """Возвращает отпечаток токена, чтобы не хранить исходный секрет в кэше."""
+
+    if token is None:
+        return None
+    return hashlib.sha256(token.encode()).hexdigest()
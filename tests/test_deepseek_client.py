@@ -0,0 +1,164 @@
+"""Тесты для клиента DeepSeek."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+
+import httpx
+import msgspec
+import pytest
+
+from src import deepseek_client as deepseek_module
+
+
+def _completion(content: str) -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def _localize(texts, reply, events: list[str] | None = None):
+    """Запускает пакетную локализацию, отвечая через ``reply(system, user)``.
+
+    ``reply`` может быть корутиной и вернуть готовый ``httpx.Response``.
+    """
+
+    requests: list[tuple[str, str]] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        messages = json.loads(request.content)["messages"]
+        system, user = messages[0]["content"], messages[1]["content"]
+        requests.append((system, user))
+        content = reply(system, user)
+        if inspect.isawaitable(content):
+            content = await content
+        if isinstance(content, httpx.Response):
+            return content
+        return _completion(content)
+
+    async def scenario() -> list[str]:
+        async with deepseek_module.DeepSeekClient(
+            api_key="test", base_url="https://deepseek.test"
+        ) as client:
+            await client._client.aclose()
+            client._client = httpx.AsyncClient(
+                base_url=client.base_url, transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await client.ensure_localization_batch(texts)
+            finally:
+                if events is not None:
+                    events.append("returned")
+
+    return asyncio.run(scenario()), requests
+
+
+def test_parse_batch_accepts_code_fence():
+    completion = '```json\n["Первый", "Второй"]\n```'
+    assert deepseek_module._parse_batch(completion) == ["Первый", "Второй"]
+
+
+def test_parse_batch_rejects_non_string_and_empty_items():
+    assert deepseek_module._parse_batch('["Первый", 2]') is None
+    assert deepseek_module._parse_batch('["Первый", "  "]') is None
+    assert deepseek_module._parse_batch("не JSON") is None
+
+
+def test_batch_translates_pending_texts_in_one_request():
+    localized, requests = _localize(
+        ["Listing", "Уже по-русски", "Airdrop"],
+        lambda system, user: '[" Листинг ", "Раздача"]',
+    )
+
+    assert localized == ["Листинг", "Уже по-русски", "Раздача"]
+    assert len(requests) == 1
+    assert requests[0] == (
+        deepseek_module.BATCH_SYSTEM_PROMPT,
+        "1. Listing\n\n2. Airdrop",
+    )
+
+
+def test_batch_with_single_pending_text_skips_batch_prompt():
+    localized, requests = _localize(
+        ["Уже по-русски", "Listing"], lambda system, user: "Листинг"
+    )
+
+    assert localized == ["Уже по-русски", "Листинг"]
+    assert requests == [(deepseek_module.SYSTEM_PROMPT, "Listing")]
+
+
+def test_batch_falls_back_to_single_requests_on_bad_reply():
+    translations = {"Listing": "Листинг", "Airdrop": "Раздача"}
+
+    def reply(system: str, user: str) -> str:
+        if system == deepseek_module.BATCH_SYSTEM_PROMPT:
+            return '["Листинг", ""]'
+        return translations[user]
+
+    localized, requests = _localize(["Listing", "Airdrop"], reply)
+
+    assert localized == ["Листинг", "Раздача"]
+    assert len(requests) == 3
+
+
+def test_batch_falls_back_on_length_mismatch():
+    def reply(system: str, user: str) -> str:
+        if system == deepseek_module.BATCH_SYSTEM_PROMPT:
+            return '["Листинг"]'
+        return f"Перевод: {user}"
+
+    localized, _ = _localize(["Listing", "Airdrop"], reply)
+
+    assert localized == ["Перевод: Listing", "Перевод: Airdrop"]
+
+
+def test_batch_splits_texts_into_chunks():
+    texts = [f"News {number}" for number in range(deepseek_module.MAX_BATCH_SIZE + 3)]
+
+    def reply(system: str, user: str) -> str:
+        return json.dumps([f"Новость {line}" for line in user.split("\n\n")])
+
+    localized, requests = _localize(texts, reply)
+
+    assert len(requests) == 2
+    assert requests[1][1] == "1. News 10\n\n2. News 11\n\n3. News 12"
+    assert localized[-1] == "Новость 3. News 12"
+
+
+def test_fallback_limits_concurrency():
+    active = [0, 0]
+
+    async def reply(system: str, user: str) -> str:
+        if system == deepseek_module.BATCH_SYSTEM_PROMPT:
+            return "[]"
+        active[0] += 1
+        active[1] = max(active)
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        return f"Перевод: {user}"
+
+    texts = [f"News {number}" for number in range(deepseek_module.MAX_BATCH_SIZE)]
+    localized, _ = _localize(texts, reply)
+
+    assert localized[0] == "Перевод: News 0"
+    assert active[1] == deepseek_module.MAX_CONCURRENT_REQUESTS
+
+
+def test_fallback_failure_cancels_remaining_requests():
+    events: list[str] = []
+
+    async def reply(system: str, user: str):
+        if system == deepseek_module.BATCH_SYSTEM_PROMPT:
+            return "[]"
+        if user == "Broken":
+            return httpx.Response(200, content=b"not json")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append(user)
+            raise
+        return f"Перевод: {user}"
+
+    with pytest.raises(msgspec.DecodeError):
+        _localize(["Slow", "Broken"], reply, events)
+    assert events == ["Slow", "returned"]
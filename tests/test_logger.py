@@ -0,0 +1,51 @@
+"""Тесты для JSON-логирования."""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import UTC, datetime
+
+from src import logger as logger_module
+
+
+def test_json_formatter_uses_record_time_in_utc():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "Привет", (), None)
+    record.created = 1_700_000_000.25
+    record._context = {"api_key": "secret", "message_id": 1}
+
+    payload = json.loads(logger_module.JsonFormatter().format(record))
+
+    assert payload["ts"] == "2023-11-14T22:13:20.250000Z"
+    expected = datetime.fromtimestamp(record.created, tz=UTC).isoformat()
+    assert payload["ts"] == expected.replace("+00:00", "Z")
+    assert payload["msg"] == "Привет"
+    assert payload["context"] == {"api_key": "***", "message_id": 1}
+
+
+def test_sanitize_context_masks_keys_consistently():
+    context = {"refresh_token": "abc", "Session": "s", "channel": "@binance"}
+
+    first = logger_module.sanitize_context(context)
+    second = logger_module.sanitize_context(context)
+
+    assert (
+        first
+        == second
+        == {"refresh_token": "***", "Session": "***", "channel": "@binance"}
+    )
+
+
+def test_log_if_skips_context_for_disabled_level():
+    adapter = logger_module.get_logger("tests.log_if")
+    adapter.logger.setLevel(logging.WARNING)
+    calls = []
+
+    def build_context():
+        calls.append(True)
+        return {}
+
+    adapter.log_if(logging.INFO, "skipped", build_context)
+    adapter.log_if(logging.ERROR, "emitted", build_context)
+
+    assert calls == [True]
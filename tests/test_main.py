@@ -0,0 +1,78 @@
+"""Тесты для основного сценария публикации."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src import main as main_module
+from src.state_store import StateStore
+from src.telegram_source import TelegramMessage
+
+
+class _StubTelegramSource:
+    async def fetch_new_messages(self, *, last_seen_id: int) -> list[TelegramMessage]:
+        return [
+            TelegramMessage(message_id=1, text="Binance listing", date=""),
+            TelegramMessage(message_id=2, text="Binance airdrop", date=""),
+            TelegramMessage(message_id=3, text="Binance bonus", date=""),
+        ]
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _StubDeepSeekClient:
+    async def __aenter__(self) -> _StubDeepSeekClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def ensure_localization_batch(self, texts: list[str]) -> list[str]:
+        return list(texts)
+
+
+class _FailingTwitterClient:
+    posted: list[str] = []
+    failure: str = "raise"
+
+    def __init__(self, *, dry_run: bool) -> None:
+        self.dry_run = dry_run
+
+    async def __aenter__(self) -> _FailingTwitterClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def post_thread(self, tweets: list[str]) -> list[str]:
+        if "airdrop" in tweets[0]:
+            if self.failure == "raise":
+                raise RuntimeError("publish failed")
+            return []
+        self.posted.append(tweets[0])
+        return ["1"]
+
+
+@pytest.mark.parametrize(
+    ("failure", "error"),
+    [("raise", "publish failed"), ("empty", "не вернул идентификаторы")],
+)
+def test_run_stops_at_first_failure_and_keeps_last_success(
+    tmp_path, monkeypatch, failure, error
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main_module, "TelegramSource", _StubTelegramSource)
+    monkeypatch.setattr(main_module, "DeepSeekClient", _StubDeepSeekClient)
+    monkeypatch.setattr(main_module, "TwitterClient", _FailingTwitterClient)
+    monkeypatch.setattr(_FailingTwitterClient, "posted", [])
+    monkeypatch.setattr(_FailingTwitterClient, "failure", failure)
+
+    with pytest.raises(RuntimeError, match=error):
+        asyncio.run(main_module.run(dry_run=False))
+
+    assert len(_FailingTwitterClient.posted) == 1
+    assert "listing" in _FailingTwitterClient.posted[0]
+    assert StateStore(tmp_path / "state.json").read().last_seen_id == 1
@@ -24,8 +24,25 @@ def test_state_store_updates_and_respects_dry_run(tmp_path):
     assert persisted.last_seen_id == 0
 
     store.update_last_seen(message_id=7, dry_run=False)
-    saved = store.read()
+    assert store.read().last_seen_id == 7
+    assert StateStore(path).read().last_seen_id == 0
+
+    store.flush()
+    saved = StateStore(path).read()
     assert saved.last_seen_id == 7
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_state_store_flush_skips_unchanged_state(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"last_seen_id": 10}', encoding="utf-8")
+    store = StateStore(path)
+
+    state = store.update_last_seen(message_id=3, dry_run=False)
+    store.flush()
+
+    assert state.last_seen_id == 10
+    assert path.read_text(encoding="utf-8") == '{"last_seen_id": 10}'
 
 
 def test_state_store_recovers_from_corrupted_file(tmp_path):
@@ -37,3 +54,25 @@ def test_state_store_recovers_from_corrupted_file(tmp_path):
 
     assert state.last_seen_id == 0
     assert path.read_text(encoding="utf-8") == '{"last_seen_id":0}'
+
+
+def test_state_store_resets_invalid_last_seen_id(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text('{"last_seen_id": "oops"}', encoding="utf-8")
+    store = StateStore(path)
+
+    state = store.read()
+
+    assert state.last_seen_id == 0
+    assert path.read_text(encoding="utf-8") == '{"last_seen_id":0}'
+
+
+def test_state_store_update_does_not_reread_file(tmp_path):
+    path = tmp_path / "state.json"
+    store = StateStore(path)
+    store.read()
+    path.write_text('{"last_seen_id": 100}', encoding="utf-8")
+
+    state = store.update_last_seen(message_id=5, dry_run=False)
+
+    assert state.last_seen_id == 5
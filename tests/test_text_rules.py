@@ -8,6 +8,15 @@ from src import text_rules
 def test_contains_cyrillic_detection():
     assert text_rules.contains_cyrillic("Тестовое сообщение")
     assert not text_rules.contains_cyrillic("Binance listing soon")
+    assert text_rules.contains_cyrillic("Binance: ёлка")
+    assert not text_rules.contains_cyrillic("Binance — €10 bonus")
+
+
+def test_insert_emojis_keeps_keyword_order():
+    result = text_rules.insert_emojis("Binance Launchpool: new LISTING")
+    assert result.startswith("🆕 🚀 🟡 ")
+    assert text_rules.insert_emojis("launchpoolisting").startswith("🆕 🚀 ")
+    assert text_rules.insert_emojis("Hello").startswith("📢 ")
 
 
 def test_generate_hashtags_limits():
@@ -16,6 +25,11 @@ def test_generate_hashtags_limits():
     assert all(tag.startswith("#") for tag in result)
 
 
+def test_generate_hashtags_deduplicates_case_insensitively():
+    result = text_rules.generate_hashtags("BNB 2024 bnb Binance listing")
+    assert result == ["#bnb", "#binance"]
+
+
 def test_build_thread_includes_links():
     hashtags = ["#binance", "#listing"]
     tweets = text_rules.build_thread(
@@ -37,3 +51,8 @@ def test_build_thread_trims_hashtags_and_long_lines():
     assert tweets, "Ожидаем хотя бы один твит"
     assert all(len(tweet) <= text_rules.MAX_TWEET_LENGTH for tweet in tweets)
     assert all(len(part) <= text_rules.MAX_TWEET_LENGTH for part in tweets)
+
+
+def test_chunk_text_normalizes_whitespace_like_textwrap():
+    assert text_rules._chunk_text("short line") == ["short line"]
+    assert text_rules._chunk_text("line one\nline two") == ["line one line two"]
@@ -0,0 +1,309 @@
+"""Тесты для клиента Twitter."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import stat
+import time
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from src import twitter_client as twitter_module
+
+
+@pytest.fixture
+def twitter_env(tmp_path, monkeypatch):
+    for name in (
+        "TWITTER_API_KEY",
+        "CLIENT_ID",
+        "TWITTER_ACCESS_TOKEN",
+        "CLIENT_SECRET",
+        "TWITTER_REDIRECT_URI",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("TWITTER_CLIENT_ID", "client")
+    monkeypatch.setenv("TWITTER_REFRESH_TOKEN", "env-refresh")
+    cache_path = tmp_path / "token.json"
+    monkeypatch.setenv("TWITTER_TOKEN_CACHE", str(cache_path))
+    return cache_path
+
+
+def _make_client() -> twitter_module.TwitterClient:
+    client = twitter_module.TwitterClient()
+    asyncio.run(client.aclose())
+    return client
+
+
+def test_token_cache_round_trip(twitter_env):
+    client = _make_client()
+    client._set_access_token("cached-access", 3600)
+    client.refresh_token = "rotated-refresh"
+    client._save_token_cache()
+
+    assert stat.S_IMODE(twitter_env.stat().st_mode) == 0o600
+    assert b"env-refresh" not in twitter_env.read_bytes()
+
+    restored = _make_client()
+    assert restored._access_token == "cached-access"
+    assert restored.refresh_token == "rotated-refresh"
+
+
+def test_token_cache_skips_expired_access_token(twitter_env):
+    client = _make_client()
+    client._set_access_token("stale-access", 30)
+    client.refresh_token = "rotated-refresh"
+    client._save_token_cache()
+
+    restored = _make_client()
+    assert restored._access_token is None
+    assert restored.refresh_token == "rotated-refresh"
+
+
+@pytest.mark.parametrize(
+    ("name", "value"),
+    [("TWITTER_REFRESH_TOKEN", "new-env-refresh"), ("TWITTER_CLIENT_ID", "other")],
+)
+def test_token_cache_ignored_when_credentials_change(
+    twitter_env, monkeypatch, name, value
+):
+    client = _make_client()
+    client._set_access_token("cached-access", 3600)
+    client.refresh_token = "rotated-refresh"
+    client._save_token_cache()
+
+    monkeypatch.setenv(name, value)
+    restored = _make_client()
+    assert restored._access_token is None
+    assert restored.refresh_token == (
+        value if name == "TWITTER_REFRESH_TOKEN" else "env-refresh"
+    )
+
+
+def test_token_cache_without_credentials_marker_is_ignored(twitter_env):
+    legacy = twitter_module._TokenCache(
+        access_token="legacy-access",
+        expires_at=time.time() + 3600,
+        refresh_token="legacy-refresh",
+    )
+    twitter_env.write_bytes(twitter_module._JSON_ENCODER.encode(legacy))
+
+    restored = _make_client()
+    assert restored._access_token is None
+    assert restored.refresh_token == "env-refresh"
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", twitter_module.TWEET_URL)
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    ("error", "expected"),
+    [
+        (_status_error(400), False),
+        (_status_error(401), False),
+        (_status_error(403), False),
+        (_status_error(404), False),
+        (_status_error(408), True),
+        (_status_error(429), True),
+        (_status_error(500), True),
+        (_status_error(503), True),
+        (httpx.ConnectError("boom"), True),
+        (httpx.ReadTimeout("slow"), True),
+        (RuntimeError("boom"), False),
+    ],
+)
+def test_is_retryable_status_table(error, expected):
+    assert twitter_module._is_retryable(error) is expected
+
+
+def test_circuit_breaker_opens_after_threshold_and_resets(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(twitter_module.time, "monotonic", lambda: now[0])
+    breaker = twitter_module._CircuitBreaker(threshold=3, max_cooldown=5.0)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open()
+
+    breaker.record_failure()
+    assert breaker.is_open()
+    now[0] += 5.0
+    assert not breaker.is_open()
+
+    breaker.record_failure()
+    assert breaker.open_until == now[0] + 5.0
+
+    breaker.record_success()
+    assert breaker.failures == 0
+    assert not breaker.is_open()
+
+
+def test_forbidden_tweet_does_not_trip_breaker(twitter_env, monkeypatch):
+    breaker = twitter_module._CircuitBreaker(threshold=1)
+    monkeypatch.setattr(twitter_module, "_TWEET_BREAKER", breaker)
+
+    async def scenario() -> None:
+        client = twitter_module.TwitterClient()
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(403))
+        )
+        client._set_access_token("access", 3600)
+        try:
+            await client._create_tweet(payload={"text": "duplicate"})
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(scenario())
+    assert breaker.failures == 0
+    assert not breaker.is_open()
+
+
+def _post_parallel(handler, tweets: list[str], events: list[str] | None = None):
+    async def scenario() -> list[str]:
+        client = twitter_module.TwitterClient()
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._set_access_token("access", 3600)
+        try:
+            return await client.post_thread(tweets, parallel=True)
+        finally:
+            if events is not None:
+                events.append("returned")
+            await client.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_parallel_thread_keeps_reply_positions(twitter_env, monkeypatch):
+    monkeypatch.setattr(
+        twitter_module, "_TWEET_BREAKER", twitter_module._CircuitBreaker()
+    )
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["text"]
+        if text == "second":
+            await asyncio.sleep(0.01)
+        return httpx.Response(201, json={"data": {"id": f"id-{text}"}})
+
+    tweet_ids = _post_parallel(handler, ["root", "second", "third"])
+
+    assert tweet_ids == ["id-root", "id-second", "id-third"]
+
+
+def test_parallel_thread_cancels_replies_on_failure(twitter_env, monkeypatch):
+    monkeypatch.setattr(
+        twitter_module, "_TWEET_BREAKER", twitter_module._CircuitBreaker()
+    )
+    events: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        text = json.loads(request.content)["text"]
+        if text == "slow":
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                events.append(text)
+                raise
+        if text == "broken":
+            return httpx.Response(403)
+        return httpx.Response(201, json={"data": {"id": f"id-{text}"}})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        _post_parallel(handler, ["root", "slow", "broken"], events)
+    assert events == ["slow", "returned"]
+
+
+def _run_with_transport(handler, action):
+    async def scenario():
+        client = twitter_module.TwitterClient()
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return client, await action(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_refresh_access_token_sends_form_and_adopts_rotation(twitter_env, monkeypatch):
+    monkeypatch.setenv("TWITTER_REFRESH_TOKEN", "a+b/c=d")
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "access_token": "fresh-access",
+                "expires_in": "7200",
+                "refresh_token": "rotated-refresh",
+            },
+        )
+
+    client, access_token = _run_with_transport(
+        handler, lambda client: client._refresh_access_token()
+    )
+
+    assert access_token == "fresh-access"
+    (request,) = requests
+    assert str(request.url) == twitter_module.TOKEN_URL
+    assert request.headers["Content-Type"] == "application/x-www-form-urlencoded"
+    assert b"refresh_token=a%2Bb%2Fc%3Dd" in request.content
+    assert parse_qs(request.content.decode()) == {
+        "grant_type": ["refresh_token"],
+        "client_id": ["client"],
+        "redirect_uri": ["https://localhost"],
+        "refresh_token": ["a+b/c=d"],
+    }
+    assert client._auth_headers["Authorization"] == "Bearer fresh-access"
+    assert 7000 < client._expires_at - time.monotonic() <= 7200
+    assert client.refresh_token == "rotated-refresh"
+    cache = twitter_module._TOKEN_CACHE_DECODER.decode(twitter_env.read_bytes())
+    assert cache.access_token == "fresh-access"
+    assert cache.refresh_token == "rotated-refresh"
+
+
+def test_refresh_without_access_token_raises_without_retry(twitter_env):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"token_type": "bearer"})
+
+    async def refresh(client: twitter_module.TwitterClient) -> None:
+        with pytest.raises(RuntimeError, match="access_token"):
+            await client._refresh_access_token()
+
+    client, _ = _run_with_transport(handler, refresh)
+
+    assert len(requests) == 1
+    assert client._access_token is None
+    assert client._auth_headers == {}
+    assert not twitter_env.exists()
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_dry_run_posts_nothing(twitter_env, parallel):
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(201, json={"data": {"id": "real"}})
+
+    async def scenario() -> list[str]:
+        client = twitter_module.TwitterClient(dry_run=True)
+        await client._client.aclose()
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with client:
+            return await client.post_thread(["one", "two", "three"], parallel=parallel)
+
+    assert asyncio.run(scenario()) == ["dry-run", "dry-run", "dry-run"]
+    assert requests == []